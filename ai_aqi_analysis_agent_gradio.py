@@ -1,21 +1,62 @@
-from typing import Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from dataclasses import dataclass
-from pydantic import BaseModel, Field
-from firecrawl import FirecrawlApp
+import asyncio
+import atexit
+import functools
+import hashlib
+import time
+import threading
+from cachetools import LRUCache, TTLCache
+import diskcache
+import faiss
+import httpx
+import numpy as np
+import orjson
+from sentence_transformers import SentenceTransformer
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 import gradio as gr
-import json
+import logging
 from dotenv import load_dotenv
 import os
-from groq import Groq
+import groq
+from groq import AsyncGroq
+import openai
+from openai import AsyncOpenAI
+from tenacity import (
+    retry,
+    retry_if_exception,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
-class AQIResponse(BaseModel):
-    success: bool
-    data: Dict[str, float]
-    status: str
-    expiresAt: str
+logging.basicConfig(level=os.getenv("LOGLEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+# Extracted AQI data keyed by normalized (country, state, city); entries expire after 5 minutes
+_AQI_CACHE: TTLCache = TTLCache(maxsize=512, ttl=300)
+_AQI_CACHE_LOCK = threading.RLock()
+
+# Development aid: with FIRECRAWL_DISK_CACHE=1, extractions are persisted on disk by URL and
+# extraction spec so restarts and dev reloads replay them. Off by default because entries
+# outlive the 5-minute freshness of the in-memory cache.
+FIRECRAWL_DISK_CACHE = os.getenv("FIRECRAWL_DISK_CACHE", "0").lower() in ("1", "true", "yes")
+FIRECRAWL_CACHE_DIR = os.getenv("FIRECRAWL_CACHE_DIR", ".firecrawl_cache")
+FIRECRAWL_CACHE_TTL = int(os.getenv("FIRECRAWL_CACHE_TTL", "3600"))
+_FIRECRAWL_DISK_CACHE = diskcache.Cache(FIRECRAWL_CACHE_DIR) if FIRECRAWL_DISK_CACHE else None
+
+FIRECRAWL_API_URL = "https://api.firecrawl.dev/v1"
+FIRECRAWL_POLL_INTERVAL = 2.0
+FIRECRAWL_POLL_TIMEOUT = float(os.getenv("FIRECRAWL_POLL_TIMEOUT", "120"))
+FIRECRAWL_BATCH_SIZE = int(os.getenv("FIRECRAWL_BATCH_SIZE", "5"))
+FIRECRAWL_MAX_RETRIES = 4
+FIRECRAWL_BACKOFF_BASE = 1.0
+FIRECRAWL_RATE_LIMIT = int(os.getenv("FIRECRAWL_RATE_LIMIT", "10"))
+FIRECRAWL_RATE_WINDOW = 60.0
+EXTRACT_PROMPT = 'Extract the current real-time AQI, temperature, humidity, wind speed, PM2.5, PM10, and CO levels from the page. Also extract the timestamp of the data.'
 
 class ExtractSchema(BaseModel):
     aqi: float = Field(description="Air Quality Index")
@@ -25,6 +66,27 @@ class ExtractSchema(BaseModel):
     pm25: float = Field(description="Particulate Matter 2.5 micrometers")
     pm10: float = Field(description="Particulate Matter 10 micrometers")
     co: float = Field(description="Carbon Monoxide level")
+    
+    # aqi is deliberately excluded: a page without an AQI must fail validation, not read as "Good"
+    @field_validator('wind_speed', 'pm25', 'pm10', 'co', 'temperature', 'humidity', mode='before')
+    @classmethod
+    def _default_none(cls, v: Optional[float]) -> float:
+        """Secondary readings missing from the page come back as None; treat them as 0.0"""
+        return 0.0 if v is None else v
+
+class AQIResponse(BaseModel):
+    success: bool
+    data: ExtractSchema
+    status: str
+    expiresAt: str
+
+# Built once at import; both are constant for the lifetime of the process
+_EXTRACT_SCHEMA = ExtractSchema.model_json_schema()
+_AQI_ADAPTER = TypeAdapter(AQIResponse)
+# Changing the prompt or schema invalidates the disk cache
+_EXTRACT_FINGERPRINT = hashlib.sha256(
+    orjson.dumps(_EXTRACT_SCHEMA, option=orjson.OPT_SORT_KEYS) + EXTRACT_PROMPT.encode()
+).hexdigest()
 
 @dataclass
 class UserInput:
@@ -34,120 +96,778 @@ class UserInput:
     medical_conditions: Optional[str]
     planned_activity: str
 
+@functools.lru_cache(maxsize=1024)
+def _normalize(part: str) -> str:
+    """Turn a location name into its URL slug"""
+    return part.lower().replace(' ', '-')
+
+@functools.lru_cache(maxsize=1024)
+def _normalize_location(country: str, state: str, city: str) -> tuple[str, str, str]:
+    """Normalize location parts into URL slugs; state is empty when not applicable"""
+    if not state or state.lower() == 'none':
+        state_clean = ''
+    else:
+        state_clean = _normalize(state)
+    
+    return _normalize(country), state_clean, _normalize(city)
+
+@functools.lru_cache(maxsize=1024)
+def _format_url(country: str, state: str, city: str) -> str:
+    """Format URL based on location, handling cases with and without state"""
+    country_clean, state_clean, city_clean = _normalize_location(country, state, city)
+    
+    if not state_clean:
+        return f"https://www.aqi.in/dashboard/{country_clean}/{city_clean}"
+    
+    return f"https://www.aqi.in/dashboard/{country_clean}/{state_clean}/{city_clean}"
+
+def _seconds_until(value: Optional[str]) -> Optional[float]:
+    """Parse a rate-limit reset header given as epoch seconds/milliseconds or a delay in seconds"""
+    if value is None:
+        return None
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+    if reset > 1e12:
+        reset /= 1000
+    if reset > 1e9:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+def _is_transient_http_error(exc: BaseException) -> bool:
+    """Rate limiting, server errors and dropped connections are worth retrying"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+# Bounded, jittered retries around the external APIs; the last error is re-raised to the caller.
+# The LLM clients are built with max_retries=0 so _llm_retry is their only retry layer.
+# Firecrawl job submission is not retried here: _start_job alone handles 429s, and resubmitting
+# after other errors could start (and bill) a duplicate job. Only status polls use this.
+_firecrawl_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_random_exponential(min=1, max=30),
+    retry=retry_if_exception(_is_transient_http_error),
+    reraise=True
+)
+_llm_retry = retry(
+    stop=stop_after_attempt(4),
+    wait=wait_random_exponential(min=1, max=30),
+    retry=retry_if_exception_type((
+        groq.RateLimitError,
+        groq.InternalServerError,
+        groq.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+        openai.APIConnectionError
+    )),
+    reraise=True
+)
+
+class FirecrawlSubmitError(Exception):
+    """A Firecrawl job was never accepted, so nothing is running or billing for it"""
+
+class RateLimiter:
+    """Client-side token bucket kept in step with Firecrawl's X-RateLimit-* response headers"""
+    
+    def __init__(self, capacity: int, window: float) -> None:
+        self.capacity = capacity
+        self.window = window
+        self._remaining = capacity
+        self._refilled = asyncio.Event()
+        self._refilled.set()
+        self._refill_handle: Optional[asyncio.TimerHandle] = None
+    
+    async def acquire(self) -> None:
+        """Wait until a request slot is available and take it"""
+        while self._remaining <= 0:
+            await self._refilled.wait()
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._exhaust(None)
+    
+    def update(self, headers: httpx.Headers) -> None:
+        """Adopt the server's view of the remaining budget and its reset time"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            self._remaining = int(remaining)
+        except ValueError:
+            return
+        if self._remaining > 0:
+            if self._refill_handle is not None:
+                self._refill_handle.cancel()
+                self._refill_handle = None
+            self._refilled.set()
+        else:
+            delay = _seconds_until(headers.get("X-RateLimit-Reset"))
+            self._exhaust(delay, reschedule=delay is not None)
+    
+    def pause(self, delay: float) -> None:
+        """Block all requests for delay seconds, e.g. after a 429"""
+        self._remaining = 0
+        self._exhaust(delay, reschedule=True)
+    
+    def _exhaust(self, delay: Optional[float], reschedule: bool = False) -> None:
+        self._refilled.clear()
+        if self._refill_handle is not None:
+            if not reschedule:
+                return
+            self._refill_handle.cancel()
+        self._refill_handle = asyncio.get_running_loop().call_later(
+            self.window if delay is None else delay, self._refill
+        )
+    
+    def _refill(self) -> None:
+        self._refill_handle = None
+        self._remaining = self.capacity
+        self._refilled.set()
+
 class AQIAnalyzer:
     
     def __init__(self) -> None:
-        self.firecrawl = FirecrawlApp(api_key=os.getenv("FIRE_CRAWL_API_KEY"))
+        self.api_key = os.getenv("FIRE_CRAWL_API_KEY")
+        # One pooled client for the process keeps TCP/TLS connections alive between requests
+        self.client = httpx.AsyncClient(
+            base_url=FIRECRAWL_API_URL,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=60.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+        )
+        self.rate_limiter = RateLimiter(FIRECRAWL_RATE_LIMIT, FIRECRAWL_RATE_WINDOW)
+    
+    async def _start_job(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit a Firecrawl job within the rate limit, waiting out 429 responses"""
+        for attempt in range(FIRECRAWL_MAX_RETRIES + 1):
+            await self.rate_limiter.acquire()
+            started = await self.client.post(path, json=payload)
+            self.rate_limiter.update(started.headers)
+            if started.status_code != 429 or attempt == FIRECRAWL_MAX_RETRIES:
+                break
+            delay = _seconds_until(started.headers.get("Retry-After"))
+            if delay is None:
+                delay = FIRECRAWL_BACKOFF_BASE * 2 ** attempt
+            logger.warning("Firecrawl rate limit hit on %s, retrying in %.1fs", path, delay)
+            self.rate_limiter.pause(delay)
+        started.raise_for_status()
+        return started.json()
+    
+    @_firecrawl_retry
+    async def _poll_status(self, path: str) -> Dict[str, Any]:
+        """Fetch a job's status once; a transient failure retries the poll, never the job"""
+        polled = await self.client.get(path)
+        polled.raise_for_status()
+        return polled.json()
     
-    def _format_url(self, country: str, state: str, city: str) -> str:
-        """Format URL based on location, handling cases with and without state"""
-        country_clean = country.lower().replace(' ', '-')
-        city_clean = city.lower().replace(' ', '-')
+    async def _wait_for_job(self, path: str, pending_statuses: tuple[str, ...]) -> Dict[str, Any]:
+        """Poll a Firecrawl job's status until it leaves the pending statuses or the timeout expires"""
+        deadline = time.monotonic() + FIRECRAWL_POLL_TIMEOUT
+        while True:
+            response = await self._poll_status(path)
+            if response.get('status') not in pending_statuses:
+                return response
+            if time.monotonic() + FIRECRAWL_POLL_INTERVAL > deadline:
+                raise TimeoutError(f"Firecrawl job {path} still {response.get('status')} after {FIRECRAWL_POLL_TIMEOUT:.0f}s")
+            await asyncio.sleep(FIRECRAWL_POLL_INTERVAL)
+    
+    async def _extract(self, url: str) -> Dict[str, Any]:
+        """Start a Firecrawl extract job for the URL and poll until it finishes"""
+        job = await self._start_job(
+            "/extract",
+            {
+                'urls': [f"{url}/*"],
+                'prompt': EXTRACT_PROMPT,
+                'schema': _EXTRACT_SCHEMA
+            }
+        )
+        if not job.get('success'):
+            raise ValueError(f"Failed to start extraction: {job.get('error', 'unknown error')}")
+        
+        return await self._wait_for_job(f"/extract/{job['id']}", ('processing', 'pending'))
+    
+    async def _batch_scrape(self, urls: list[str]) -> list[Dict[str, Any]]:
+        """Scrape several URLs with a single Firecrawl batch job and return the per-page results"""
+        try:
+            job = await self._start_job(
+                "/batch/scrape",
+                {
+                    'urls': urls,
+                    'formats': ['extract'],
+                    'extract': {
+                        'prompt': EXTRACT_PROMPT,
+                        'schema': _EXTRACT_SCHEMA
+                    }
+                }
+            )
+        except httpx.HTTPError as e:
+            raise FirecrawlSubmitError(f"Failed to start batch scrape: {str(e)}") from e
+        if not job.get('success'):
+            raise FirecrawlSubmitError(f"Failed to start batch scrape: {job.get('error', 'unknown error')}")
+        
+        response = await self._wait_for_job(f"/batch/scrape/{job['id']}", ('scraping',))
+        if response.get('status') != 'completed':
+            raise ValueError(f"Batch scrape did not complete: {response.get('status')}")
+        return response.get('data', [])
+    
+    async def _get_cached(self, key: tuple[str, str, str], url: str) -> Optional[Dict[str, float]]:
+        """Look up recent AQI data in memory, then on disk when the disk cache is enabled"""
+        with _AQI_CACHE_LOCK:
+            cached = _AQI_CACHE.get(key)
+        if cached is not None:
+            return dict(cached)
         
-        if not state or state.lower() == 'none':
-            return f"https://www.aqi.in/dashboard/{country_clean}/{city_clean}"
+        if _FIRECRAWL_DISK_CACHE is None:
+            return None
+        # Served as-is rather than promoted, so a disk entry never gains a fresh memory TTL
+        cached = await asyncio.to_thread(_FIRECRAWL_DISK_CACHE.get, f"{_EXTRACT_FINGERPRINT}:{url}")
+        return dict(cached) if cached is not None else None
+    
+    async def _store_cached(self, key: tuple[str, str, str], url: str, data: Dict[str, float]) -> None:
+        with _AQI_CACHE_LOCK:
+            _AQI_CACHE[key] = dict(data)
+        if _FIRECRAWL_DISK_CACHE is not None:
+            await asyncio.to_thread(
+                _FIRECRAWL_DISK_CACHE.set, f"{_EXTRACT_FINGERPRINT}:{url}", dict(data), expire=FIRECRAWL_CACHE_TTL
+            )
+    
+    def _validate_response(self, response: Dict[str, Any]) -> Dict[str, float]:
+        """Validate a Firecrawl extraction result and return the AQI data"""
+        aqi_response = _AQI_ADAPTER.validate_python(response)
+        if not aqi_response.success:
+            raise ValueError(f"Failed to fetch AQI data: {aqi_response.status}")
         
-        state_clean = state.lower().replace(' ', '-')
-        return f"https://www.aqi.in/dashboard/{country_clean}/{state_clean}/{city_clean}"
+        return aqi_response.data.model_dump()
     
-    def fetch_aqi_data(self, city: str, state: str, country: str) -> tuple[Dict[str, float], str]:
-        """Fetch AQI data using Firecrawl"""
+    async def fetch_aqi_data(
+        self,
+        city: str,
+        state: str,
+        country: str
+    ) -> tuple[Dict[str, float], str, bool]:
+        """Fetch AQI data using Firecrawl, reusing recent results from the memory and disk caches.
+        
+        The flag is False when nothing could be fetched and the data is the all-zero fallback.
+        """
         try:
-            url = self._format_url(country, state, city)
+            url = _format_url(country, state, city)
             info_msg = f"Accessing URL: {url}"
             
-            response = self.firecrawl.extract(
-                urls=[f"{url}/*"],
-                params={
-                    'prompt': 'Extract the current real-time AQI, temperature, humidity, wind speed, PM2.5, PM10, and CO levels from the page. Also extract the timestamp of the data.',
-                    'schema': ExtractSchema.model_json_schema()
-                }
-            )
+            key = _normalize_location(country, state, city)
+            cached = await self._get_cached(key, url)
+            if cached is not None:
+                return cached, f"{info_msg} (cached)", True
             
-            print("Firecrawl Response:", response)  # Debugging: Print raw response
+            response = await self._extract(url)
             
-            # Check for None values and assign defaults
-            if response['data']['wind_speed'] is None:
-                response['data']['wind_speed'] = 0.0  # Default value for wind speed
+            logger.debug("Firecrawl response: %s", response)
             
-            aqi_response = AQIResponse(**response)
-            if not aqi_response.success:
-                raise ValueError(f"Failed to fetch AQI data: {aqi_response.status}")
+            data = self._validate_response(response)
             
-            return aqi_response.data, info_msg
+            await self._store_cached(key, url, data)
+            
+            return data, info_msg, True
             
         except Exception as e:
             error_msg = f"Error fetching AQI data: {str(e)}"
-            print(error_msg)  # Debugging: Print error message
-            return {
-                'aqi': 0,
-                'temperature': 0,
-                'humidity': 0,
-                'wind_speed': 0,
-                'pm25': 0,
-                'pm10': 0,
-                'co': 0
-            }, error_msg
+            logger.exception(error_msg)
+            return self._unavailable(error_msg)
+    
+    def _unavailable(self, error_msg: str) -> tuple[Dict[str, float], str, bool]:
+        """All-zero placeholder result for a location whose AQI data could not be fetched"""
+        return {
+            'aqi': 0,
+            'temperature': 0,
+            'humidity': 0,
+            'wind_speed': 0,
+            'pm25': 0,
+            'pm10': 0,
+            'co': 0
+        }, error_msg, False
+    
+    async def fetch_aqi_data_batch(
+        self,
+        locations: list[tuple[str, str, str]]
+    ) -> Dict[tuple[str, str, str], tuple[Dict[str, float], str, bool]]:
+        """Fetch AQI data for (city, state, country) locations using batched Firecrawl scrapes.
+        
+        Results are keyed by the normalized location. Only locations whose batch was
+        never accepted (e.g. rate limited) are retried as concurrent single-URL extracts;
+        a batch that was accepted but failed or timed out is not resubmitted, and its
+        unresolved locations are reported as unavailable.
+        """
+        results = {}
+        pending = {}
+        for city, state, country in locations:
+            key = _normalize_location(country, state, city)
+            url = _format_url(country, state, city)
+            cached = await self._get_cached(key, url)
+            if cached is not None:
+                results[key] = (cached, f"Accessing URL: {url} (cached)", True)
+            else:
+                pending[url] = (key, (city, state, country))
+        
+        urls = list(pending)
+        chunks = [urls[i:i + FIRECRAWL_BATCH_SIZE] for i in range(0, len(urls), FIRECRAWL_BATCH_SIZE)]
+        batches = await asyncio.gather(*[self._batch_scrape(chunk) for chunk in chunks], return_exceptions=True)
+        
+        fallback = {}
+        for chunk, batch in zip(chunks, batches):
+            if isinstance(batch, FirecrawlSubmitError):
+                logger.warning("Batch scrape not accepted, falling back to single requests: %s", batch)
+                for url in chunk:
+                    fallback[url] = pending.pop(url)
+                continue
+            if isinstance(batch, Exception):
+                logger.warning("Batch scrape failed: %s", batch)
+                for url in chunk:
+                    key, _ = pending.pop(url)
+                    results[key] = self._unavailable(f"Error fetching AQI data: {str(batch)}")
+                continue
+            for item in batch:
+                source_url = item.get('metadata', {}).get('sourceURL') or ''
+                url = source_url if source_url in pending else source_url.rstrip('/')
+                if url not in pending or not item.get('extract'):
+                    continue
+                try:
+                    data = self._validate_response({
+                        'success': True,
+                        'data': item['extract'],
+                        'status': 'completed',
+                        'expiresAt': ''
+                    })
+                except Exception:
+                    continue
+                key, _ = pending.pop(url)
+                await self._store_cached(key, url, data)
+                results[key] = (data, f"Accessing URL: {url}", True)
+        
+        for url, (key, _) in pending.items():
+            results[key] = self._unavailable(f"Error fetching AQI data: no result for {url} in batch scrape")
+        
+        # The rate limiter paces these, so they can all be in flight together
+        fallback_results = await asyncio.gather(*[
+            self.fetch_aqi_data(city, state, country)
+            for _, (city, state, country) in fallback.values()
+        ])
+        for (key, _), result in zip(fallback.values(), fallback_results):
+            results[key] = result
+        
+        return results
+
+# Upper bounds of the AQI bands below Hazardous, and the label for each band
+_AQI_BAND_BOUNDS = np.array([50, 100, 150, 200, 300])
+_AQI_CATEGORIES = np.array([
+    "Good",
+    "Moderate",
+    "Unhealthy for Sensitive Groups",
+    "Unhealthy",
+    "Very Unhealthy",
+    "Hazardous"
+])
+
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_PATH = os.getenv("SEMANTIC_CACHE_PATH", "semantic_cache")
+SEMANTIC_CACHE_THRESHOLD = 0.92
+# Advice such as "Best Time" goes stale, and conditions/activities are free text, so bound both age and size
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "3600"))
+SEMANTIC_CACHE_MAX_PARTITIONS = 512
+SEMANTIC_CACHE_MAX_ENTRIES = 32
+
+@dataclass
+class _CachePartition:
+    index: faiss.IndexFlatIP
+    responses: list[str]
+    created: list[float]
+
+class SemanticCache:
+    """Recommendations partitioned by an exact key and matched on activity embeddings by cosine similarity.
+    
+    The partition holds the safety-relevant fields (location, AQI band, model tier, medical conditions) so
+    they never match approximately; only the free-text activity is compared by embedding.
+    Entries expire after SEMANTIC_CACHE_TTL seconds, each partition keeps its newest
+    SEMANTIC_CACHE_MAX_ENTRIES answers, and the least recently used partitions are dropped
+    beyond SEMANTIC_CACHE_MAX_PARTITIONS. Embedding or index failures are logged and treated
+    as a miss; if the embedding model cannot be loaded the cache disables itself.
+    """
+    
+    def __init__(self, path: str, threshold: float = SEMANTIC_CACHE_THRESHOLD) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.enabled = True
+        self._model: Optional[SentenceTransformer] = None
+        self._model_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._partitions: LRUCache = LRUCache(maxsize=SEMANTIC_CACHE_MAX_PARTITIONS)
+        self._load()
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed the text as a normalized float32 row vector, loading the model on first use"""
+        with self._model_lock:
+            if not self.enabled:
+                raise RuntimeError("semantic cache disabled after the embedding model failed to load")
+            if self._model is None:
+                try:
+                    self._model = SentenceTransformer(SEMANTIC_CACHE_MODEL, backend="onnx")
+                except Exception:
+                    # Don't pay the failed download again on every request
+                    self.enabled = False
+                    raise
+        return self._model.encode([text], normalize_embeddings=True).astype(np.float32)
+    
+    def _prune(self, partition: _CachePartition, keep: np.ndarray) -> _CachePartition:
+        """Rebuild a partition keeping only the entries selected by the boolean mask"""
+        embeddings = partition.index.reconstruct_n(0, partition.index.ntotal)[keep]
+        index = faiss.IndexFlatIP(partition.index.d)
+        index.add(embeddings)
+        return _CachePartition(
+            index,
+            [r for r, k in zip(partition.responses, keep) if k],
+            [c for c, k in zip(partition.created, keep) if k]
+        )
+    
+    def _fresh(self, key: tuple[str, ...]) -> Optional[_CachePartition]:
+        """Return the partition with expired entries removed, or None if nothing is left"""
+        partition = self._partitions.get(key)
+        if partition is None:
+            return None
+        keep = np.array(partition.created) > time.time() - SEMANTIC_CACHE_TTL
+        if not keep.all():
+            partition = self._prune(partition, keep)
+            if not partition.responses:
+                del self._partitions[key]
+                return None
+            self._partitions[key] = partition
+        return partition
+    
+    def lookup(self, partition: tuple[str, ...], text: str) -> tuple[Optional[str], Optional[np.ndarray]]:
+        """Return the closest cached response above the threshold (or None) and the text's embedding"""
+        if not self.enabled:
+            return None, None
+        try:
+            embedding = self._embed(text)
+            with self._lock:
+                entry = self._fresh(partition)
+                if entry is None:
+                    return None, embedding
+                scores, ids = entry.index.search(embedding, 1)
+                if scores[0][0] >= self.threshold:
+                    return entry.responses[ids[0][0]], embedding
+            return None, embedding
+        except Exception:
+            logger.warning(
+                "Semantic cache lookup failed, treating it as a miss%s",
+                "" if self.enabled else "; cache disabled",
+                exc_info=True
+            )
+            return None, None
+    
+    def insert(self, partition: tuple[str, ...], embedding: Optional[np.ndarray], response: str) -> None:
+        if embedding is None or not self.enabled:
+            return
+        try:
+            with self._lock:
+                entry = self._fresh(partition)
+                if entry is None:
+                    entry = _CachePartition(faiss.IndexFlatIP(embedding.shape[1]), [], [])
+                elif len(entry.responses) >= SEMANTIC_CACHE_MAX_ENTRIES:
+                    keep = np.arange(len(entry.responses)) > len(entry.responses) - SEMANTIC_CACHE_MAX_ENTRIES
+                    entry = self._prune(entry, keep)
+                entry.index.add(embedding)
+                entry.responses.append(response)
+                entry.created.append(time.time())
+                self._partitions[partition] = entry
+        except Exception:
+            logger.warning("Semantic cache insert failed", exc_info=True)
+    
+    def save(self) -> None:
+        """Write every partition's embeddings, responses and creation times to disk"""
+        with self._lock:
+            if not self._partitions:
+                return
+            entries = [
+                {
+                    'partition': list(key),
+                    'embeddings': partition.index.reconstruct_n(0, partition.index.ntotal),
+                    'responses': partition.responses,
+                    'created': partition.created
+                }
+                for key, partition in self._partitions.items()
+            ]
+        with open(f"{self.path}.json", "wb") as f:
+            f.write(orjson.dumps(entries, option=orjson.OPT_SERIALIZE_NUMPY))
+    
+    def _load(self) -> None:
+        if not os.path.exists(f"{self.path}.json"):
+            return
+        try:
+            with open(f"{self.path}.json", "rb") as f:
+                entries = orjson.loads(f.read())
+            for entry in entries:
+                embeddings = np.array(entry['embeddings'], dtype=np.float32)
+                index = faiss.IndexFlatIP(embeddings.shape[1])
+                index.add(embeddings)
+                key = tuple(entry['partition'])
+                self._partitions[key] = _CachePartition(index, list(entry['responses']), list(entry['created']))
+                # Drops entries that expired while the app was down
+                self._fresh(key)
+        except Exception as e:
+            logger.warning("Ignoring unreadable semantic cache: %s", e)
+            self._partitions.clear()
+
+_RECOMMENDATION_CACHE = SemanticCache(SEMANTIC_CACHE_PATH)
+atexit.register(_RECOMMENDATION_CACHE.save)
+
+FAST_MODEL = "llama-3.1-8b-instant"
+STRONG_MODEL = "llama-3.3-70b-versatile"
+# AQI_BACKEND=local sends completions to an OpenAI-compatible server such as llama-cpp-python
+# running a quantized model, e.g. llama-3.1-8B-Instruct-Q4_K_M.gguf, instead of Groq
+AQI_BACKEND = os.getenv("AQI_BACKEND", "groq").lower()
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:8080/v1")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "llama-3.1-8b-instruct-q4_k_m")
+# Headers every answer must contain; a fast-model answer missing any of them is escalated
+_REQUIRED_SECTIONS = ("Impact", "Precautions", "Advisability", "Best Time")
+# Shown around an escalation so the answer being replaced doesn't just vanish
+_ESCALATING_NOTICE = "\n\n---\n⏳ *This answer was incomplete; regenerating it with a more capable model…*"
+_ESCALATED_NOTICE = "*Regenerated with a more capable model.*\n\n"
+
+# Static instructions go first and never change, so Groq can serve the prefix from its prompt cache
+_SYSTEM_PROMPT = """
+You are an environmental health assistant. You receive current air quality and weather
+readings for a location together with the user's medical conditions and planned activity,
+and you give practical, personalized health recommendations.
+
+Interpret the readings on the standard AQI scale:
+- 0-50 Good: air quality poses little or no risk.
+- 51-100 Moderate: acceptable, but unusually sensitive people may be affected.
+- 101-150 Unhealthy for Sensitive Groups: people with respiratory or heart conditions,
+  children and older adults should reduce prolonged or heavy exertion outdoors.
+- 151-200 Unhealthy: everyone may begin to feel effects; sensitive groups more seriously.
+- 201-300 Very Unhealthy: health alert; everyone should avoid prolonged exertion outdoors.
+- 301 and above Hazardous: emergency conditions; avoid outdoor activity entirely.
+PM2.5 and PM10 are in µg/m³ and CO is in ppb. Consider temperature, humidity and wind speed
+as factors that can worsen or relieve exposure (e.g. heat, stagnant air, high humidity).
+
+When judging the planned activity, weigh its duration and intensity against the AQI band,
+and be more cautious when the user reports respiratory, cardiovascular or allergic
+conditions. Suggest concrete precautions such as masks, shorter sessions, indoor
+alternatives or lower intensity, and recommend a time of day when conditions are usually
+better if that applies.
+
+Respond in Markdown with exactly these sections:
+**Comprehensive Health Recommendations:**
+1. **Impact of Current Air Quality on Health:**
+2. **Necessary Safety Precautions for Planned Activity:**
+3. **Advisability of Planned Activity:**
+4. **Best Time to Conduct the Activity:**
+"""
+
+# Per-request user message, filled from the AQI readings and user input
+_PROMPT_TEMPLATE = """Location: {city}, {state}, {country}
+AQI: {aqi}
+PM2.5: {pm25} µg/m³
+PM10: {pm10} µg/m³
+CO: {co} ppb
+Temperature: {temperature}°C
+Humidity: {humidity}%
+Wind Speed: {wind_speed} km/h
+Medical Conditions: {medical_conditions}
+Planned Activity: {planned_activity}"""
 
 class HealthRecommendationAgent:
     
     def __init__(self) -> None:
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        if AQI_BACKEND == "local":
+            self.fast_model = self.strong_model = LOCAL_LLM_MODEL
+        else:
+            self.fast_model, self.strong_model = FAST_MODEL, STRONG_MODEL
+        self._client: Any = None
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+    
+    @property
+    def client(self) -> Any:
+        """Build the LLM client on first use so configuration errors surface per request, not at import"""
+        if self._client is None:
+            if AQI_BACKEND == "local":
+                # llama.cpp ignores the key, but the client requires one
+                self._client = AsyncOpenAI(base_url=LOCAL_LLM_BASE_URL, api_key="sk-no-key-required", max_retries=0)
+            elif AQI_BACKEND == "groq":
+                self._client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), max_retries=0)
+            else:
+                raise ValueError(f"Unknown AQI_BACKEND: {AQI_BACKEND} (expected 'groq' or 'local')")
+        return self._client
     
-    def get_recommendations(
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens served from Groq's prompt cache"""
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+    
+    async def get_recommendations(
         self,
         aqi_data: Dict[str, float],
         user_input: UserInput
-    ) -> str:
+    ) -> AsyncIterator[str]:
+        """Stream the recommendations, yielding the accumulated text as tokens arrive"""
         prompt = self._create_prompt(aqi_data, user_input)
+        messages = [
+            {
+                "role": "system",
+                "content": _SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            }
+        ]
         
-        chat_completion = self.client.chat.completions.create(
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-        )
+        # Try the small model first unless the case is borderline for someone with a condition
+        if self.fast_model == self.strong_model or self._needs_strong_model(aqi_data, user_input):
+            models = (self.strong_model,)
+        else:
+            models = (self.fast_model, self.strong_model)
         
-        return chat_completion.choices[0].message.content
-    
-    def _create_prompt(self, aqi_data: Dict[str, float], user_input: UserInput) -> str:
-        return f"""
-        Based on the following air quality conditions in {user_input.city}, {user_input.state}, {user_input.country}:
-        - Overall AQI: {aqi_data['aqi']}
-        - PM2.5 Level: {aqi_data['pm25']} µg/m³
-        - PM10 Level: {aqi_data['pm10']} µg/m³
-        - CO Level: {aqi_data['co']} ppb
+        # Similar questions about the same city and AQI band reuse an earlier answer. The first
+        # completion is started speculatively while the embedding lookup runs and dropped on a hit.
+        lookup_task = asyncio.create_task(asyncio.to_thread(
+            _RECOMMENDATION_CACHE.lookup,
+            self._semantic_partition(aqi_data, user_input),
+            user_input.planned_activity.strip().lower()
+        ))
+        stream_task = asyncio.create_task(self._open_stream(messages, models[0]))
+        try:
+            cached, embedding = await lookup_task
+        except Exception:
+            # lookup() handles its own errors, so this is the worker thread itself failing;
+            # still just a miss: keep the speculative stream and skip the insert
+            logger.warning("Semantic cache lookup task could not run, treating it as a miss", exc_info=True)
+            cached, embedding = None, None
+        except BaseException:
+            await self._discard_stream(stream_task)
+            raise
+        if cached is not None:
+            await self._discard_stream(stream_task)
+            yield cached
+            return
         
-        Weather conditions:
-        - Temperature: {aqi_data['temperature']}°C
-        - Humidity: {aqi_data['humidity']}%
-        - Wind Speed: {aqi_data['wind_speed']} km/h
+        content = ""
+        for i, model in enumerate(models):
+            stream = await stream_task if i == 0 else await self._open_stream(messages, model)
+            notice = _ESCALATED_NOTICE if i > 0 else ""
+            async for content in self._stream_completion(stream):
+                yield notice + content
+            if model == self.strong_model or self._is_complete(content):
+                break
+            logger.info("Escalating recommendations from %s to %s", model, self.strong_model)
+            yield content + _ESCALATING_NOTICE
         
-        User's Context:
-        - Medical Conditions: {user_input.medical_conditions or 'None'}
-        - Planned Activity: {user_input.planned_activity}
-        **Comprehensive Health Recommendations:**
-        1. **Impact of Current Air Quality on Health:**
-        2. **Necessary Safety Precautions for Planned Activity:**
-        3. **Advisability of Planned Activity:**
-        4. **Best Time to Conduct the Activity:**
-        """
+        _RECOMMENDATION_CACHE.insert(self._semantic_partition(aqi_data, user_input), embedding, content)
+    
+    async def _stream_completion(self, stream: Any) -> AsyncIterator[str]:
+        """Consume an open completion stream, yielding the accumulated text"""
+        content = ""
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                content += chunk.choices[0].delta.content
+                yield content
+            # Groq reports usage on the final chunk under x_groq
+            x_groq = getattr(chunk, 'x_groq', None)
+            if x_groq is not None and getattr(x_groq, 'usage', None) is not None:
+                self._record_usage(x_groq.usage)
+    
+    @_llm_retry
+    async def _open_stream(self, messages: list[Dict[str, str]], model: str) -> Any:
+        """Start a streaming completion; retried only before any tokens have been yielded"""
+        return await self.client.chat.completions.create(
+            messages=messages,
+            model=model,
+            stream=True,
+        )
+    
+    async def _discard_stream(self, stream_task: "asyncio.Task[Any]") -> None:
+        """Cancel a speculative completion, closing its stream if it already opened"""
+        stream_task.cancel()
+        try:
+            stream = await stream_task
+        except asyncio.CancelledError:
+            return
+        except Exception:
+            logger.debug("Speculative completion failed before it was discarded", exc_info=True)
+            return
+        await stream.close()
+    
+    def _needs_strong_model(self, aqi_data: Dict[str, float], user_input: UserInput) -> bool:
+        medical = (user_input.medical_conditions or '').strip().lower()
+        return 100 <= aqi_data['aqi'] <= 200 and medical not in ('', 'none')
+    
+    def _is_complete(self, content: str) -> bool:
+        return all(section in content for section in _REQUIRED_SECTIONS)
+    
+    def _semantic_partition(self, aqi_data: Dict[str, float], user_input: UserInput) -> tuple[str, ...]:
+        """Exact cache partition: answers are only reused for the same location, AQI category,
+        model tier and medical conditions"""
+        band = int(np.searchsorted(_AQI_BAND_BOUNDS, aqi_data['aqi'], side='left'))
+        tier = 'strong' if self._needs_strong_model(aqi_data, user_input) else 'tiered'
+        medical = (user_input.medical_conditions or '').strip().lower() or 'none'
+        return (
+            *_normalize_location(user_input.country, user_input.state, user_input.city),
+            _AQI_CATEGORIES[band],
+            tier,
+            medical
+        )
+    
+    def _record_usage(self, usage: Any) -> None:
+        """Accumulate prompt and cached token counts reported by Groq"""
+        if usage is None:
+            return
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = getattr(details, 'cached_tokens', None) or 0
+        self.prompt_tokens += usage.prompt_tokens or 0
+        self.cached_tokens += cached
+        logger.debug("Groq prompt tokens: %s, cached: %s", usage.prompt_tokens, cached)
+    
+    def _create_prompt(self, aqi_data: Dict[str, float], user_input: UserInput) -> str:
+        return _PROMPT_TEMPLATE.format_map({
+            **aqi_data,
+            'city': user_input.city,
+            'state': user_input.state,
+            'country': user_input.country,
+            'medical_conditions': user_input.medical_conditions or 'None',
+            'planned_activity': user_input.planned_activity
+        })
+
+# Shared across requests so connection pools and the env lookup are reused
+_AQI_ANALYZER = AQIAnalyzer()
+_HEALTH_AGENT = HealthRecommendationAgent()
 
-def analyze_conditions(
+_HEADER_MD = """
+# 🌍 AQI Analysis Agent
+Get personalized health recommendations based on air quality conditions.
+"""
+
+_WARNING_MSG = """
+⚠️ Note: The data shown may not match real-time values on the website. 
+This could be due to:
+- Cached data in Firecrawl
+- Rate limiting
+- Website updates not being captured
+
+Consider refreshing or checking the website directly for real-time values.
+"""
+
+async def analyze_conditions(
     city: str,
     state: str,
     country: str,
     medical_conditions: str,
     planned_activity: str
-) -> tuple[str, str, str, str]:
-    """Analyze conditions and return AQI data, recommendations, and status messages"""
+) -> AsyncIterator[tuple[Optional[Dict[str, Any]], str, str, str]]:
+    """Analyze conditions and yield AQI data, recommendations so far, and status messages"""
+    aqi_json = None
     try:
-        # Initialize analyzers
-        aqi_analyzer = AQIAnalyzer()
-        health_agent = HealthRecommendationAgent()
+        aqi_analyzer = _AQI_ANALYZER
+        health_agent = _HEALTH_AGENT
         
         # Create user input
         user_input = UserInput(
@@ -159,14 +879,19 @@ def analyze_conditions(
         )
         
         # Get AQI data
-        aqi_data, info_msg = aqi_analyzer.fetch_aqi_data(
+        aqi_data, info_msg, ok = await aqi_analyzer.fetch_aqi_data(
             city=user_input.city,
             state=user_input.state,
             country=user_input.country
         )
         
-        # Format AQI data for display
-        aqi_json = json.dumps({
+        # Don't generate (or cache) advice for the all-zero placeholder
+        if not ok:
+            yield None, "AQI data unavailable", info_msg, ""
+            return
+        
+        # Format AQI data for display; gr.JSON takes the dict as-is
+        aqi_json = {
             "Air Quality Index (AQI)": aqi_data['aqi'],
             "PM2.5": f"{aqi_data['pm25']} µg/m³",
             "PM10": f"{aqi_data['pm10']} µg/m³",
@@ -174,36 +899,116 @@ def analyze_conditions(
             "Temperature": f"{aqi_data['temperature']}°C",
             "Humidity": f"{aqi_data['humidity']}%",
             "Wind Speed": f"{aqi_data['wind_speed']} km/h"
-        }, indent=2)
+        }
         
-        # Get recommendations
-        recommendations = health_agent.get_recommendations(aqi_data, user_input)
+        warning_msg = _WARNING_MSG
         
-        warning_msg = """
-        ⚠️ Note: The data shown may not match real-time values on the website. 
-        This could be due to:
-        - Cached data in Firecrawl
-        - Rate limiting
-        - Website updates not being captured
+        # Show the AQI data right away, then stream the recommendations into place
+        recommendations = ""
+        yield aqi_json, recommendations, info_msg, warning_msg
+        async for recommendations in health_agent.get_recommendations(aqi_data, user_input):
+            yield aqi_json, recommendations, info_msg, warning_msg
         
-        Consider refreshing or checking the website directly for real-time values.
-        """
-        
-        return aqi_json, recommendations, info_msg, warning_msg
+        info_msg = f"{info_msg} | Prompt cache hit rate: {health_agent.cache_hit_rate:.0%}"
+        yield aqi_json, recommendations, info_msg, warning_msg
         
     except Exception as e:
         error_msg = f"Error occurred: {str(e)}"
-        return "", "Analysis failed", error_msg, ""
+        # Keep any AQI data already shown; only the recommendations failed in that case
+        yield aqi_json, "Analysis failed", error_msg, ""
+
+async def _collect(stream: AsyncIterator[str]) -> str:
+    """Drain a recommendation stream and return the final text"""
+    text = ""
+    async for text in stream:
+        pass
+    return text
+
+async def analyze_many(
+    user_inputs: list[UserInput]
+) -> list[tuple[Dict[str, float], str, str, bool]]:
+    """Analyze several locations concurrently, returning AQI data, recommendations, status and
+    whether AQI data was available for each input"""
+    aqi_analyzer = _AQI_ANALYZER
+    health_agent = _HEALTH_AGENT
+    
+    # Scrape all locations in as few Firecrawl batches as possible, then overlap the Groq completions
+    aqi_by_location = await aqi_analyzer.fetch_aqi_data_batch(
+        [(ui.city, ui.state, ui.country) for ui in user_inputs]
+    )
+    aqi_results = [
+        aqi_by_location[_normalize_location(ui.country, ui.state, ui.city)]
+        for ui in user_inputs
+    ]
+    # Locations without AQI data get no recommendations rather than advice for all-zero readings
+    recommendations = await asyncio.gather(*[
+        _collect(health_agent.get_recommendations(aqi_data, ui)) if ok else asyncio.sleep(0, "")
+        for (aqi_data, _, ok), ui in zip(aqi_results, user_inputs)
+    ], return_exceptions=True)
+    
+    results = []
+    for (aqi_data, info_msg, ok), recs in zip(aqi_results, recommendations):
+        if not ok:
+            results.append((aqi_data, "AQI data unavailable", info_msg, False))
+        elif isinstance(recs, Exception):
+            results.append((aqi_data, "Analysis failed", f"Error occurred: {str(recs)}", True))
+        else:
+            results.append((aqi_data, recs, info_msg, True))
+    return results
+
+_AQI_FIELDS = ('aqi', 'pm25', 'pm10', 'co', 'temperature', 'humidity', 'wind_speed')
+_RISK_WEIGHTS = np.array([0.5, 0.3, 0.2, 0.0, 0.0, 0.0, 0.0])
+
+def score_aqi_batch(
+    aqi_data: list[Dict[str, float]],
+    available: list[bool]
+) -> tuple[list[str], list[Optional[float]]]:
+    """Return the AQI category and composite health-risk score for each reading.
+    
+    Readings that could not be fetched are reported as "Unavailable" with no score.
+    """
+    if not aqi_data:
+        return [], []
+    readings = np.array([[data[field] for field in _AQI_FIELDS] for data in aqi_data], dtype=np.float64)
+    mask = np.array(available, dtype=bool)
+    categories = _AQI_CATEGORIES[np.searchsorted(_AQI_BAND_BOUNDS, readings[:, 0], side='left')]
+    categories = np.where(mask, categories, "Unavailable")
+    risk_scores = np.round(readings @ _RISK_WEIGHTS, 1)
+    return categories.tolist(), [
+        score if ok else None for score, ok in zip(risk_scores.tolist(), available)
+    ]
+
+async def analyze_batch(rows: list[list[str]]) -> list[list[Any]]:
+    """Analyze a table of locations and return one result row per location"""
+    user_inputs = [
+        UserInput(
+            city=city,
+            state=state,
+            country=country,
+            medical_conditions=medical_conditions,
+            planned_activity=planned_activity
+        )
+        for city, state, country, medical_conditions, planned_activity in rows
+        if city and country
+    ]
+    
+    results = await analyze_many(user_inputs)
+    categories, risk_scores = score_aqi_batch(
+        [aqi_data for aqi_data, _, _, _ in results],
+        [ok for _, _, _, ok in results]
+    )
+    
+    rows = []
+    for ui, (aqi_data, recs, info_msg, ok), category, risk in zip(user_inputs, results, categories, risk_scores):
+        # Leave readings blank for failed fetches instead of showing the zero placeholders
+        aqi, pm25, pm10 = (aqi_data['aqi'], aqi_data['pm25'], aqi_data['pm10']) if ok else (None, None, None)
+        rows.append([ui.city, ui.state, ui.country, aqi, category, risk, pm25, pm10, info_msg, recs])
+    return rows
 
 def create_demo() -> gr.Blocks:
     """Create and configure the Gradio interface"""
     with gr.Blocks(title="AQI Analysis Agent") as demo:
-        gr.Markdown(
-            """
-            # 🌍 AQI Analysis Agent
-            Get personalized health recommendations based on air quality conditions.
-            """
-        )
+        gr.Markdown(_HEADER_MD)
         
         # Location Details
         with gr.Row():
@@ -249,7 +1054,9 @@ def create_demo() -> gr.Blocks:
                 medical_conditions,
                 planned_activity
             ],
-            outputs=[aqi_data_json, recommendations, info_box, warning_box]
+            outputs=[aqi_data_json, recommendations, info_box, warning_box],
+            # Pure I/O wait on Firecrawl and Groq, so don't cap this event
+            concurrency_limit=None
         )
         
         # Examples
@@ -262,9 +1069,38 @@ def create_demo() -> gr.Blocks:
             ],
             inputs=[city, state, country, medical_conditions, planned_activity]
         )
+        
+        # Batch Analysis
+        with gr.Accordion("🗺️ Batch Analysis (multiple cities)", open=False):
+            batch_input = gr.Dataframe(
+                headers=["City", "State", "Country", "Medical Conditions", "Planned Activity"],
+                datatype=["str", "str", "str", "str", "str"],
+                value=[
+                    ["Mumbai", "Maharashtra", "India", "asthma", "morning walk for 30 minutes"],
+                    ["Delhi", "", "India", "", "outdoor yoga session"]
+                ],
+                col_count=(5, "fixed"),
+                type="array",
+                interactive=True
+            )
+            batch_btn = gr.Button("🔍 Analyze All", variant="primary")
+            batch_output = gr.Dataframe(
+                headers=["City", "State", "Country", "AQI", "Category", "Risk Score", "PM2.5", "PM10", "Status", "Recommendations"],
+                type="array",
+                wrap=True,
+                interactive=False
+            )
+            batch_btn.click(
+                fn=analyze_batch,
+                inputs=[batch_input],
+                outputs=[batch_output]
+            )
     
     return demo
 
 if __name__ == "__main__":
     demo = create_demo()
-    demo.launch(share=True)
\ No newline at end of file
+    # Handlers are async and I/O-bound, so let the event loop multiplex requests;
+    # uvicorn runs on uvloop automatically when it is installed
+    demo.queue(default_concurrency_limit=16, max_size=64)
+    demo.launch(share=True, server_name="0.0.0.0")
\ No newline at end of file